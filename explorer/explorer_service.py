@@ -1,4 +1,63 @@
+import re
+from functools import lru_cache
+from operator import itemgetter
+
 from .data_service import DataService
+from .sparql_templates import LABEL_SERVICE_CLAUSE, render
+
+# Patterns for the raw-query label enhancement below, compiled once at
+# module import so no per-request re.compile (or pattern-cache lookup)
+# happens on the request path.
+_SELECT_RE = re.compile(r'SELECT\s+(.*?)\s+WHERE', re.IGNORECASE | re.DOTALL)
+_VAR_RE = re.compile(r'\?(\w+)')
+_LABEL_SERVICE_RE = re.compile(r'SERVICE\s+wikibase:label', re.IGNORECASE)
+_HAS_LIMIT_RE = re.compile(r'\bLIMIT\s+\d+', re.IGNORECASE)
+_HAS_OFFSET_RE = re.compile(r'\bOFFSET\s+\d+', re.IGNORECASE)
+
+# Single alternation classifying every entity-bound variable in one scan:
+# either the object of a wdt: predicate, or the subject of a wdt: triple or
+# rdfs:label statement. This subsumes the per-variable patterns it replaced.
+_ENTITY_TOKEN_RE = re.compile(r'wdt:\w+\s+\?(\w+)|\?(\w+)\s+(?:wdt:|rdfs:label)')
+
+
+def _entity_variables(query):
+    """Returns the set of entity-bound variable names, in one query scan."""
+    return {
+        match.group(1) or match.group(2)
+        for match in _ENTITY_TOKEN_RE.finditer(query)
+    }
+
+
+@lru_cache(maxsize=2048)
+def _enhance_query_with_labels(query):
+    """
+    Appends the wikibase:label SERVICE clause to a raw SPARQL query when it
+    selects entity-bound variables but forgot the clause — the most common
+    mistake in hand-written Wikidata queries. Queries that already use the
+    label service, or select no entity variables, pass through unchanged.
+    Enhancement is a pure function of the query text, so results are
+    memoized and re-submissions of the same query skip all regex work.
+    """
+    if _LABEL_SERVICE_RE.search(query):
+        return query
+
+    select_match = _SELECT_RE.search(query)
+    if not select_match:
+        return query
+
+    select_vars = _VAR_RE.findall(select_match.group(1))
+    if not _entity_variables(query).intersection(select_vars):
+        return query
+
+    brace_index = query.rfind('}')
+    if brace_index == -1:
+        return query
+    # Single join instead of chained '+' so the enhanced query is assembled
+    # in one allocation rather than one intermediate copy per operand.
+    return ''.join(
+        (query[:brace_index], LABEL_SERVICE_CLAUSE, '\n', query[brace_index:])
+    )
+
 
 class ExplorerService:
     """
@@ -6,44 +65,114 @@ class ExplorerService:
     It contains the business logic for the data explorer.
     """
     
+    # Raw queries without their own LIMIT are fetched in pages of
+    # PAGE_SIZE rows and capped at MAX_ROWS overall.
+    PAGE_SIZE = 1000
+    MAX_ROWS = 10000
+
     def __init__(self):
         """Initializes the DataService dependency."""
         self.data_service = DataService()
 
-    def generate_sparql_query(self, qid, properties_str):
+    def _execute_paginated(self, sparql_query):
         """
-        Generates a basic SPARQL query to retrieve properties for a given QID.
-        :param qid: The Wikidata QID (e.g., 'Q30' for USA).
+        Collects a LIMIT-less query page by page via the data layer's
+        paginator, stopping at MAX_ROWS so an unbounded query cannot starve
+        the endpoint timeout or this process's memory.
+        """
+        head_vars = []
+        results = []
+        pages = self.data_service.iter_query_pages(sparql_query, self.PAGE_SIZE)
+        for page_vars, rows in pages:
+            head_vars = page_vars or head_vars
+            results.extend(rows)
+            if len(results) >= self.MAX_ROWS:
+                del results[self.MAX_ROWS:]
+                break
+        return head_vars, results
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def generate_sparql_query(qid, properties_str):
+        """
+        Generates a SPARQL query retrieving properties for one or more QIDs.
+        Deterministic in its inputs, so results are memoized: repeated
+        lookups of the same (qid, properties) pair skip parsing, validation
+        and string assembly, and return the identical query string — which
+        in turn hits the data layer's memoized cache-key derivation.
+        Multiple QIDs are coalesced into a single VALUES block, so a batch
+        of entities with the same property set costs one endpoint
+        round-trip instead of one per entity.
+        :param qid: Comma-separated Wikidata QID(s) (e.g., 'Q30' or 'Q30,Q145').
         :param properties_str: Comma-separated string of property IDs (e.g., 'P31,P1082').
         :return: A complete SPARQL query string.
         """
         if not qid or not properties_str:
             raise ValueError("QID and Properties are required for QID query generation.")
 
-        qid = qid.strip().upper()
+        qids = [q.strip().upper() for q in qid.split(',') if q.strip()]
         # Basic check for QID format
-        if not qid.startswith('Q') or not qid[1:].isdigit():
-             raise ValueError("QID must start with 'Q' followed by digits.")
+        for candidate in qids:
+            if not candidate.startswith('Q') or not candidate[1:].isdigit():
+                raise ValueError("Each QID must start with 'Q' followed by digits.")
 
         properties = [p.strip().upper() for p in properties_str.split(',') if p.strip()]
-        
+
         select_vars = [f'?{p}' for p in properties]
-        where_clauses = [f'wd:{qid} wdt:{p} ?{p} .' for p in properties]
-        
-        select_line = " ".join(select_vars)
-        where_block = "\n    ".join(where_clauses)
+        # Bind properties against ?item so every QID in the VALUES block is
+        # covered by the same triple patterns.
+        where_clauses = [f'?item wdt:{p} ?{p} .' for p in properties]
+
+        return render(
+            'qid_lookup',
+            select_line=" ".join(select_vars),
+            values_block=" ".join(f'wd:{q}' for q in qids),
+            where_block="\n    ".join(where_clauses),
+        )
 
-        sparql_query = f"""
-SELECT DISTINCT ?itemLabel {select_line} 
-WHERE {{
-    VALUES ?item {{ wd:{qid} }}
-    SERVICE wikibase:label {{ bd:serviceParam wikibase:language "[AUTO_LANGUAGE],en" . ?item rdfs:label ?itemLabel . }}
-    {where_block}
-}}
-LIMIT 100
-"""
-        return sparql_query.strip()
 
+    def get_entity_details_batch(self, qids, properties_str):
+        """
+        Fetches the given properties for several QIDs with one endpoint
+        round-trip (one VALUES-batched query) and regroups the flat
+        result rows into one dict per entity. Turns the N-requests-for-N-
+        entities pattern into a single handshake and query-planner pass.
+        :param qids: Iterable of QID strings (e.g. ['Q30', 'Q145']).
+        :param properties_str: Comma-separated property IDs (e.g. 'P31,P1082').
+        :return: Dict mapping QID -> {'label': ..., 'properties': {pid: [values]}}.
+        """
+        sparql_query = self.generate_sparql_query(','.join(qids), properties_str)
+        head_vars, results = self.data_service.execute_sparql_query(sparql_query)
+
+        value_vars = [v for v in head_vars if v not in ('item', 'itemLabel')]
+        # The data layer's reshape guarantees every head var is present in
+        # every row, so C-implemented itemgetters (built once per result
+        # set) can extract the cells without per-row .get() bytecode. An
+        # itemgetter over one key returns a scalar, so the single-property
+        # case is normalized back to a tuple.
+        get_item = itemgetter('item', 'itemLabel')
+        get_values = itemgetter(*value_vars) if value_vars else None
+        single_value = len(value_vars) == 1
+
+        entities = {}
+        # Dedup via set membership: 'value not in values' would rescan the
+        # value list per cell, going quadratic on entities with many rows.
+        seen = set()
+        for row in results:
+            item_uri, label = get_item(row)
+            qid = item_uri.rsplit('/', 1)[-1]
+            entity = entities.get(qid)
+            if entity is None:
+                entity = entities[qid] = {'label': label, 'properties': {}}
+            if get_values is None:
+                continue
+            properties = entity['properties']
+            values = (get_values(row),) if single_value else get_values(row)
+            for var, value in zip(value_vars, values):
+                if value and (qid, var, value) not in seen:
+                    seen.add((qid, var, value))
+                    properties.setdefault(var, []).append(value)
+        return entities
 
     def execute_query(self, query_type, identifier, query_input):
         """
@@ -64,12 +193,23 @@ LIMIT 100
             if query_type == 'qid':
                 sparql_query = self.generate_sparql_query(identifier, query_input)
             elif query_type == 'sparql':
-                sparql_query = query_input
+                sparql_query = _enhance_query_with_labels(query_input)
             else:
                 raise ValueError("Invalid query_type specified.")
 
-            # Execute the SPARQL query
-            head_vars, results = self.data_service.execute_sparql_query(sparql_query)
+            # Execute the SPARQL query; unbounded raw queries go through
+            # the bounded paginator instead of one giant request. A query
+            # carrying its own LIMIT or OFFSET counts as bounded — the
+            # paginator appends both clauses, and stacking them on the
+            # user's own solution modifiers is a SPARQL grammar error.
+            if (
+                query_type == 'sparql'
+                and not _HAS_LIMIT_RE.search(sparql_query)
+                and not _HAS_OFFSET_RE.search(sparql_query)
+            ):
+                head_vars, results = self._execute_paginated(sparql_query)
+            else:
+                head_vars, results = self.data_service.execute_sparql_query(sparql_query)
 
         except ValueError as e:
             error_message = f"Input Error: {e}"
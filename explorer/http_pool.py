@@ -0,0 +1,37 @@
+"""
+Process-wide worker pool for I/O that should not hold a WSGI worker.
+
+Each Django worker handles one request at a time; any blocking call that
+the response does not depend on (cache population, fire-and-forget
+writes) serializes unrelated requests behind it. Work submitted here runs
+on daemon threads from a shared, bounded pool instead. A plain
+ThreadPoolExecutor is used deliberately — no gevent/monkey-patching, so
+it composes safely with pymongo and requests.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('SPARQL_POOL', '16')),
+    thread_name_prefix='explorer-io',
+)
+
+
+def submit(fn, *args, **kwargs):
+    """
+    Schedules fn(*args, **kwargs) on the shared pool and returns the
+    Future. Callers that do not consume the result should still let the
+    future log failures rather than lose them silently.
+    """
+    future = _executor.submit(fn, *args, **kwargs)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def _log_failure(future):
+    exc = future.exception()
+    if exc is not None:
+        logger.warning("Background task failed: %s", exc)
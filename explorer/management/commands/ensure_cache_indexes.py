@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from explorer.data_service import DataService
+
+
+class Command(BaseCommand):
+    help = (
+        "Ensures the MongoDB cache collection has its TTL index. "
+        "Run at deploy time so the first request does not pay for index setup."
+    )
+
+    def handle(self, *args, **options):
+        service = DataService()
+        if not service.is_db_connected:
+            self.stderr.write(self.style.ERROR("MongoDB is not reachable; no index was created."))
+            return
+
+        service.ensure_indexes()
+        self.stdout.write(self.style.SUCCESS("Cache TTL index is in place."))
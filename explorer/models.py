@@ -1 +1,19 @@
-# Intentionally empty as per standard Django structure, data logic is in data_service.py
\ No newline at end of file
+from django.db import models
+
+
+class SavedQuery(models.Model):
+    """
+    A user-saved SPARQL query. created_at carries db_index=True because
+    list views order by it; without the index the database sorts the whole
+    table on every listing as it grows.
+    """
+    title = models.CharField(max_length=200, unique=True)
+    query = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = 'explorer_saved_query'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.title
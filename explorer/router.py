@@ -0,0 +1,40 @@
+"""
+Endpoint routing for SPARQL queries.
+
+The public Wikidata endpoint caps queries at 60s wall-clock and is often
+the slowest link; QLever's Wikidata instance answers simple basic-graph-
+pattern queries orders of magnitude faster but does not support every
+Blazegraph extension (notably the wikibase:label SERVICE). The router
+sends queries that are provably simple — one SELECT over a single,
+unnested group pattern — to the fast endpoint when one is configured,
+and everything else to the canonical endpoint. The fast path is opt-in:
+with QLEVER_ENDPOINT unset, every query routes to Wikidata as before.
+"""
+import re
+from functools import lru_cache
+
+from django.conf import settings
+
+_QLEVER_ENDPOINT = getattr(settings, 'QLEVER_ENDPOINT', '')
+_WIKIDATA_ENDPOINT = settings.WIKIDATA_ENDPOINT
+
+# A simple query: optional PREFIX lines, one SELECT whose group pattern
+# contains no nested braces — which also excludes every SERVICE clause
+# (label service included), subqueries and OPTIONAL blocks.
+_SIMPLE_RE = re.compile(
+    r'^\s*(?:PREFIX[^\n]*\n)*\s*'
+    r'SELECT[^{]+\{[^{}]+\}'
+    r'\s*(?:ORDER\s+BY[^\n]*)?\s*(?:LIMIT\s+\d+)?\s*(?:OFFSET\s+\d+)?\s*$',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@lru_cache(maxsize=1024)
+def pick_endpoint(query):
+    """
+    Returns the endpoint URL a query should be sent to. Memoized so a
+    repeated query skips the regex classification entirely.
+    """
+    if _QLEVER_ENDPOINT and _SIMPLE_RE.match(query):
+        return _QLEVER_ENDPOINT
+    return _WIKIDATA_ENDPOINT
@@ -0,0 +1,96 @@
+"""
+Serialization for SavedQuery rows, memoized across requests.
+
+The saved-query list is read on every page load but changes rarely, so
+serialization is cached at two levels: per-row dicts in an lru_cache
+keyed on (pk, created_at timestamp), and the whole JSON body for the
+list endpoint as one bytes object. Both are dropped whenever a row is
+saved or deleted.
+"""
+import json
+import logging
+import threading
+from functools import lru_cache
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import SavedQuery
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, default=str).encode('utf-8')
+
+
+@lru_cache(maxsize=2048)
+def _serialize_saved_query(pk, version):
+    """
+    Serializes one SavedQuery to a plain dict. `version` is the row's
+    created_at timestamp: it is part of the cache key so a replaced row
+    never serves a stale entry, and it is never read beyond that.
+    """
+    data = (
+        SavedQuery.objects.filter(pk=pk)
+        .values('id', 'title', 'query', 'created_at')
+        .first()
+    )
+    data['created_at'] = data['created_at'].isoformat()
+    return data
+
+
+def serialized_saved_queries():
+    """
+    Returns all saved queries as plain dicts, newest first. Only (pk,
+    created_at) pairs are fetched from the database; full rows are read
+    on serialization-cache misses only.
+    """
+    return [
+        _serialize_saved_query(pk, created_at.timestamp())
+        for pk, created_at in SavedQuery.objects.values_list('pk', 'created_at')
+    ]
+
+
+class _SavedQueryCache:
+    """
+    The fully serialized JSON body for the queries/ endpoint, held as one
+    bytes object per process. Between writes, serving the list costs a
+    single attribute read — no ORM hydration, no per-row serialization,
+    no response encoding. A write drops the body; the next read rebuilds
+    it once under a lock.
+    """
+    _body = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls):
+        body = cls._body
+        if body is None:
+            with cls._lock:
+                if cls._body is None:
+                    rows = list(SavedQuery.objects.values(
+                        'id', 'title', 'query', 'created_at'
+                    ))
+                    cls._body = _dumps({'queries': rows})
+                body = cls._body
+        return body
+
+    @classmethod
+    def invalidate(cls):
+        cls._body = None
+
+
+def saved_queries_json():
+    """Returns the saved-query list as ready-to-send JSON bytes."""
+    return _SavedQueryCache.get()
+
+
+@receiver(post_save, sender=SavedQuery)
+@receiver(post_delete, sender=SavedQuery)
+def _invalidate_serialization_cache(sender, **kwargs):
+    _serialize_saved_query.cache_clear()
+    _SavedQueryCache.invalidate()
@@ -0,0 +1,46 @@
+"""
+SPARQL query templates, collected in one module.
+
+Templates are constant scaffolding; only the per-request fragments vary.
+Keeping them here rather than as inline literals in the services gives
+each template a single owner and guarantees stable whitespace, so
+semantically identical queries normalize to the same cache key. render()
+is memoized on (template, fragments): a hot combination returns the
+exact same string object, which in turn hits the memoized cache-key
+derivation downstream.
+"""
+from functools import lru_cache
+
+# Appended to raw queries that select entity variables but lack the
+# label service (see explorer_service._enhance_query_with_labels).
+LABEL_SERVICE_CLAUSE = (
+    '    SERVICE wikibase:label '
+    '{ bd:serviceParam wikibase:language "[AUTO_LANGUAGE],en" . }'
+)
+
+# Batch QID/property lookup; QIDs are coalesced into one VALUES block.
+QID_LOOKUP = """\
+SELECT DISTINCT ?item ?itemLabel {select_line}
+WHERE {{
+    VALUES ?item {{ {values_block} }}
+    SERVICE wikibase:label {{ bd:serviceParam wikibase:language "[AUTO_LANGUAGE],en" . ?item rdfs:label ?itemLabel . }}
+    {where_block}
+}}
+LIMIT 100"""
+
+# Pre-filled example shown in the raw-SPARQL form.
+DEFAULT_SPARQL_EXAMPLE = (
+    'SELECT ?item ?itemLabel WHERE { ?item wdt:P31 wd:Q5 . '
+    'SERVICE wikibase:label '
+    '{ bd:serviceParam wikibase:language "[AUTO_LANGUAGE],en" . } } LIMIT 10'
+)
+
+_TEMPLATES = {
+    'qid_lookup': QID_LOOKUP,
+}
+
+
+@lru_cache(maxsize=4096)
+def render(name, **fragments):
+    """Renders a named template; memoized per (name, fragments)."""
+    return _TEMPLATES[name].format(**fragments)
@@ -1,8 +1,18 @@
 from django.urls import path
-from .views import DataExplorerView
+from .views import (
+    DataExplorerView,
+    entity_details_batch,
+    execute_query,
+    execute_query_get,
+    list_queries,
+)
 
 app_name = 'explorer'
 
 urlpatterns = [
     path('', DataExplorerView.as_view(), name='data_explorer'),
+    path('queries/', list_queries, name='list_queries'),
+    path('api/query/', execute_query, name='execute_query'),
+    path('api/query/cached/', execute_query_get, name='execute_query_get'),
+    path('api/entities/', entity_details_batch, name='entity_details_batch'),
 ]
\ No newline at end of file
@@ -1,6 +1,200 @@
+import hashlib
+import json
+from functools import cache
+
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_POST
+
+from . import http_pool
+from .data_service import generate_cache_key, rewrite_query
 from .explorer_service import ExplorerService
+from .saved_queries import saved_queries_json, serialized_saved_queries
+from .sparql_templates import DEFAULT_SPARQL_EXAMPLE
+
+# orjson is several times faster than stdlib json on the large, nested
+# structures these endpoints shuttle; fall back to stdlib if unavailable.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+
+# msgpack is 2-5x faster to decode client-side and ~30-50%% smaller on
+# the wire than JSON for URI-heavy binding structures; endpoints offer it
+# behind ?fmt=msgpack and fall back to JSON when it is not installed.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def _wants_msgpack(request):
+    return msgpack is not None and request.GET.get('fmt') == 'msgpack'
+
+
+def _msgpack_response(data):
+    return HttpResponse(
+        msgpack.packb(data, use_bin_type=True, default=str),
+        content_type='application/msgpack',
+    )
+
+
+def _json_response(data, status=200):
+    """JsonResponse equivalent that encodes with orjson when available."""
+    if orjson is None:
+        return JsonResponse(data, status=status)
+    return HttpResponse(
+        orjson.dumps(data), content_type='application/json', status=status
+    )
+
+
+@cache
+def _service():
+    """
+    Returns the process-wide ExplorerService. The service is stateless
+    and its DataService shares one Mongo client and HTTP session at class
+    level, so one instance per process is safe and lets its memoized
+    helpers warm up across requests instead of per request.
+    """
+    return ExplorerService()
+
+
+def _saved_queries_etag(request):
+    """
+    ETag for list_queries: a hash of the cached body bytes. Hashing the
+    representation (not max(created_at), which edits to existing rows
+    leave unchanged) means any write that the signal receivers see also
+    changes the validator.
+    """
+    return f'"{hashlib.blake2b(saved_queries_json(), digest_size=8).hexdigest()}"'
+
+
+@condition(etag_func=_saved_queries_etag)
+def list_queries(request):
+    """
+    Returns all saved queries as JSON, newest first. The body comes back
+    as pre-serialized bytes that are rebuilt only after a write, so a
+    repeat request does no ORM or JSON work at all — and a client that
+    revalidates with If-None-Match gets a bodyless 304 when nothing
+    changed. ?fmt=msgpack returns the same list msgpack-encoded instead.
+    """
+    if _wants_msgpack(request):
+        return _msgpack_response({'queries': serialized_saved_queries()})
+    return HttpResponse(saved_queries_json(), content_type='application/json')
+
+
+def entity_details_batch(request):
+    """
+    Returns details for up to 50 entities (?id=Q30&id=Q145...) from one
+    VALUES-batched SPARQL round-trip, grouped per entity. One XHR from
+    the results page replaces one request per displayed entity.
+    """
+    qids = request.GET.getlist('id')[:50]
+    if not qids:
+        return _json_response({'error': "At least one 'id' parameter is required."}, status=400)
+
+    properties_str = request.GET.get('props', 'P31')
+    try:
+        entities = _service().get_entity_details_batch(qids, properties_str)
+    except ValueError as e:
+        return _json_response({'error': f'Input Error: {e}'}, status=400)
+    except RuntimeError as e:
+        return _json_response({'error': f'Query Execution Error: {e}'}, status=502)
+    return _json_response({'entities': entities})
+
+
+def _raw_query_response(query, as_msgpack=False):
+    """
+    Shared passthrough body for the query API: serve the endpoint's raw
+    SPARQL JSON bytes from cache or one remote round-trip, never parsing
+    them here; cache population runs on the background pool. With
+    as_msgpack the result is transcoded once server-side — the only path
+    that parses the bytes — for clients that decode msgpack faster.
+    """
+    # Rewrite before key derivation so the clamped and unclamped forms
+    # of the same query share one cache entry.
+    query = rewrite_query(query)
+    data_service = _service().data_service
+    key = generate_cache_key(query)
+    raw = data_service.get_cached_raw_by_key(key)
+    if raw is None:
+        try:
+            raw = data_service.fetch_sparql_raw(query)
+        except Exception as e:
+            return _json_response({'error': f'SPARQL execution failed: {e}'}, status=502)
+        http_pool.submit(data_service.set_cached_raw_by_key, key, raw)
+
+    if as_msgpack:
+        return _msgpack_response(_json_loads(raw))
+    return HttpResponse(raw, content_type='application/sparql-results+json')
+
+
+# csrf_exempt: this endpoint is for non-browser API consumers, which
+# have no way to obtain a CSRF token. It executes read-only queries and
+# touches no session state, so the protection buys nothing here.
+@csrf_exempt
+@require_POST
+def execute_query(request):
+    """
+    Executes a raw SPARQL query and returns the endpoint's standard
+    SPARQL JSON. The endpoint's bytes are handed back to the client
+    as-is — never parsed and re-encoded here — and cached in the
+    background, so a cache miss costs this worker one remote round-trip
+    and zero JSON work.
+    """
+    # orjson.JSONDecodeError and json.JSONDecodeError are both ValueError
+    # subclasses, so one catch covers either codec.
+    try:
+        payload = _json_loads(request.body or b'{}')
+    except ValueError:
+        return _json_response({'error': 'Request body must be valid JSON.'}, status=400)
+    if not isinstance(payload, dict):
+        return _json_response({'error': 'Request body must be a JSON object.'}, status=400)
+
+    query = (payload.get('query') or '').strip()
+    if not query:
+        return _json_response({'error': "'query' is required."}, status=400)
+
+    return _raw_query_response(query, as_msgpack=_wants_msgpack(request))
+
+
+def _query_etag(request):
+    """
+    ETag for the GET query variant: a hash of the cached response bytes,
+    mirroring _raw_query_response's key derivation. A query with no
+    cache entry yields no ETag (never a 304), so revalidating clients
+    see refreshed results once the old entry expires; the query text
+    alone would validate the same URL forever.
+    """
+    query = (request.GET.get('q') or '').strip()
+    if not query:
+        return None
+    key = generate_cache_key(rewrite_query(query))
+    raw = _service().data_service.get_cached_raw_by_key(key)
+    if raw is None:
+        return None
+    return f'"{hashlib.blake2b(raw, digest_size=8).hexdigest()}"'
+
+
+@condition(etag_func=_query_etag)
+def execute_query_get(request):
+    """
+    GET variant of the query API (?q=...) for cacheable, bookmarkable
+    queries. The ETag hashes the cached response bytes, so a client
+    revalidating a still-cached query gets a bodyless 304, and a new
+    result after expiry produces a new validator.
+    """
+    query = (request.GET.get('q') or '').strip()
+    if not query:
+        return _json_response({'error': "'q' is required."}, status=400)
+
+    return _raw_query_response(query, as_msgpack=_wants_msgpack(request))
+
 
 class DataExplorerView(View):
     """
@@ -31,7 +225,7 @@ class DataExplorerView(View):
             query_input = request.POST.get('sparql_query_input', '').strip()
         
         # Execute the query via the service layer
-        service = ExplorerService()
+        service = _service()
         head_vars, results, is_db_connected, error_message = service.execute_query(
             query_type=query_type,
             identifier=identifier,
@@ -54,7 +248,7 @@ class DataExplorerView(View):
 
     def _get_default_context(self):
         """Provides default context for the initial GET request."""
-        service = ExplorerService()
+        service = _service()
         return {
             'head_vars': [],
             'results': [],
@@ -63,5 +257,6 @@ class DataExplorerView(View):
             'query_type': 'qid', # Default to QID view
             'qid_input': 'Q30',
             'properties_input': 'P31,P1082,P6',
-            'sparql_query_input': 'SELECT ?item ?itemLabel WHERE { ?item wdt:P31 wd:Q5 . SERVICE wikibase:label { bd:serviceParam wikibase:language "[AUTO_LANGUAGE],en" . } } LIMIT 10',
+            'sparql_query_input': DEFAULT_SPARQL_EXAMPLE,
+            'saved_queries': serialized_saved_queries(),
         }
\ No newline at end of file